@@ -8,15 +8,16 @@ and account activation.
 import logging
 from typing import Annotated
 
+from asyncpg import Record
 from fastapi import APIRouter, Depends, status, HTTPException, BackgroundTasks
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
+from app.dependencies.auth import get_current_user
 from app.dependencies.deps import get_user_service
+from app.exceptions.security import PasswordHashingBusyException
 from app.exceptions.user import (
     UserAlreadyExistsException,
     InvalidActivationCodeException,
     UserAlreadyActivatedException,
-    InvalidCredentialsException,
 )
 from app.schemas.user import (
     UserCreate,
@@ -28,7 +29,6 @@ from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBasic()
 
 
 @router.post(
@@ -57,7 +57,8 @@ async def register_user(
         The created user representation with ``is_active`` set to False.
 
     Raises:
-        HTTPException: If the email is already registered or validation fails.
+        HTTPException: If the email is already registered or validation fails,
+        or 429 if every password-hashing slot is in use.
     """
     try:
         user = await user_service.register_user(
@@ -65,13 +66,20 @@ async def register_user(
             password=user_data.password,
             background_tasks=background_tasks,
         )
-        return UserResponse(**user)
+        return UserResponse.model_construct(**user)
     except UserAlreadyExistsException as e:
-        logger.warning(f"Registration failed: {e}")
+        logger.warning("Registration failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Email {user_data.email} is already registered",
         )
+    except PasswordHashingBusyException as e:
+        logger.warning("Registration rejected: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message,
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.post(
@@ -82,7 +90,7 @@ async def register_user(
     description="Generate and send a 4-digit activation code via email. Requires Basic Auth with user credentials.",
 )
 async def request_activation_code(
-    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    user: Annotated[Record, Depends(get_current_user)],
     background_tasks: BackgroundTasks,
     user_service: UserService = Depends(get_user_service),
 ) -> MessageResponse:
@@ -93,7 +101,7 @@ async def request_activation_code(
     email and password.
 
     Args:
-        credentials: HTTP Basic authentication credentials.
+        user: User authenticated from the HTTP Basic credentials.
         background_tasks: BackgroundTasks dependency.
         user_service: User service Dependency.
 
@@ -105,23 +113,17 @@ async def request_activation_code(
         HTTPException: If authentication fails or the user
         account does not exist.
     """
-    email = credentials.username
+    email = user["email"]
     try:
         await user_service.request_activation_code(
-            email=email,
-            password=credentials.password,
+            user=user,
             background_tasks=background_tasks,
         )
-        return MessageResponse(message=f"Activation code sent to your email {email}")
-    except InvalidCredentialsException as e:
-        logger.warning(f"Authentication failed for activation code request: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Basic"},
+        return MessageResponse.model_construct(
+            message=f"Activation code sent to your email {email}"
         )
     except UserAlreadyActivatedException as e:
-        logger.warning(f"Activation code request failed: {e}")
+        logger.warning("Activation code request failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User account is already activated",
@@ -137,7 +139,7 @@ async def request_activation_code(
 )
 async def activate_user(
     activation_data: ActivateUserRequest,
-    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    user: Annotated[Record, Depends(get_current_user)],
     user_service: UserService = Depends(get_user_service),
 ) -> MessageResponse:
     """
@@ -149,7 +151,7 @@ async def activate_user(
 
     Args:
         activation_data: Request payload containing the activation code.
-        credentials: HTTP Basic authentication credentials.
+        user: User authenticated from the HTTP Basic credentials.
         user_service: User service Dependency.
     Returns:
         A confirmation message indicating that the account
@@ -161,26 +163,18 @@ async def activate_user(
     """
     try:
         await user_service.activate_user(
-            email=credentials.username,
-            password=credentials.password,
+            user=user,
             code=activation_data.code,
         )
-        return MessageResponse(message="Account activated successfully")
-    except InvalidCredentialsException as e:
-        logger.warning(f"Authentication failed for activation: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Basic"},
-        )
+        return MessageResponse.model_construct(message="Account activated successfully")
     except UserAlreadyActivatedException as e:
-        logger.warning(f"Activation failed: {e}")
+        logger.warning("Activation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User account is already activated",
         )
     except InvalidActivationCodeException as e:
-        logger.warning(f"Activation failed: {e}")
+        logger.warning("Activation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired activation code",
@@ -3,14 +3,37 @@ Mailpit HTTP client for sending emails via Mailpit API.
 This client handles the low-level HTTP communication with Mailpit.
 """
 
+import asyncio
 import logging
 import httpx
+import orjson
 from typing import Optional
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# Errors raised before the request reached Mailpit, so a retry cannot send a duplicate
+_UNDELIVERED_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _is_retryable(error: httpx.HTTPError) -> bool:
+    """
+    Tell whether a failed Mailpit call is worth retrying.
+
+    Args:
+        error: The error raised by the HTTP call
+
+    Returns:
+        bool: True for 5xx responses and errors raised before the request was
+            sent. Read/write timeouts and protocol errors are not retried:
+            Mailpit may already have accepted the email.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, _UNDELIVERED_ERRORS)
+
 
 class MailpitClient:
     """
@@ -28,6 +51,13 @@ class MailpitClient:
         self.client = client
         self.api_url = settings.email_api_url
         self.timeout = settings.email_api_timeout
+        self.max_retries = settings.email_api_max_retries
+        self.retry_backoff = settings.email_api_retry_backoff_seconds
+        # Default sender is constant, build it once instead of on every send
+        self._default_sender = {
+            "Email": settings.from_email,
+            "Name": settings.from_name,
+        }
 
     async def send_email(
         self,
@@ -50,13 +80,18 @@ class MailpitClient:
             from_name: Sender name (defaults to settings.from_name)
 
         Returns:
-            bool: True if email was sent successfully, False otherwise
+            bool: True if email was sent successfully, False otherwise.
+                Transient failures are retried up to ``max_retries`` times first.
         """
-        from_email = from_email or settings.from_email
-        from_name = from_name or settings.from_name
+        sender = self._default_sender
+        if from_email or from_name:
+            sender = {
+                "Email": from_email or sender["Email"],
+                "Name": from_name or sender["Name"],
+            }
 
         payload = {
-            "From": {"Email": from_email, "Name": from_name},
+            "From": sender,
             "To": [{"Email": to_email}],
             "Subject": subject,
             "Text": text_body,
@@ -65,37 +100,77 @@ class MailpitClient:
         if html_body:
             payload["HTML"] = html_body
 
-        try:
-            logger.info(f"Sending email to {to_email} via Mailpit API: {self.api_url}")
-
-            response = await self.client.post(
-                self.api_url,
-                json=payload,
-                timeout=self.timeout,
-            )
-
-            response.raise_for_status()
-
-            logger.info(
-                f"Email sent successfully to {to_email} "
-                f"(status: {response.status_code})"
-            )
-            return True
-
-        except httpx.TimeoutException:
-            logger.error(f"Mailpit API timeout after {self.timeout}s: {self.api_url}")
-            return False
+        logger.info("Sending email to %s via Mailpit API: %s", to_email, self.api_url)
+        content = orjson.dumps(payload)
+
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.post(
+                    self.api_url,
+                    content=content,
+                    headers=_JSON_HEADERS,
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+
+                logger.info(
+                    "Email sent successfully to %s (status: %s)",
+                    to_email,
+                    response.status_code,
+                )
+                return True
+
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    logger.error(
+                        "Failed to send email to %s via Mailpit API %s "
+                        "after %s attempt(s): %r",
+                        to_email,
+                        self.api_url,
+                        attempt + 1,
+                        e,
+                    )
+                    return False
+
+            except Exception as e:
+                logger.error("Unexpected error calling Mailpit API: %s", e)
+                return False
+
+            # Exponential backoff (50ms, 200ms, ...) on the same keep-alive client
+            await asyncio.sleep(self.retry_backoff * 4**attempt)
+            attempt += 1
+
+
+class NullMailpitClient:
+    """
+    Drop-in replacement for MailpitClient that never calls the Mailpit API.
+    Used outside production when email sending is disabled, so local runs
+    and CI skip the HTTP round-trip entirely.
+    """
 
-        except httpx.ConnectError as e:
-            logger.error(f"Failed to connect to Mailpit API {self.api_url}: {str(e)}")
-            return False
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        text_body: str,
+        html_body: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+    ) -> bool:
+        """
+        Log the email instead of sending it.
 
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                f"Mailpit API returned error status {e.response.status_code}: {str(e)}"
-            )
-            return False
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            text_body: Plain text body
+            html_body: HTML body (optional)
+            from_email: Sender email (ignored)
+            from_name: Sender name (ignored)
 
-        except Exception as e:
-            logger.error(f"Unexpected error calling Mailpit API: {str(e)}")
-            return False
+        Returns:
+            bool: Always True
+        """
+        logger.info("Email sending disabled, skipping '%s' to %s", subject, to_email)
+        return True
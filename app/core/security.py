@@ -2,30 +2,62 @@
 Security utilities for password hashing and verification.
 """
 
+import asyncio
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 
 from app.core.config import settings
+from app.exceptions.security import PasswordHashingBusyException
+
+_T = TypeVar("_T")
+
+# Argon2id hasher, built once and shared by every hash/verify call
+_PASSWORD_HASHER = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
+# Prefixes of bcrypt hashes created before the switch to Argon2id
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Dedicated executor so hashing neither starves nor is starved by other to_thread work.
+# Created lazily and shut down with the application (see shutdown_hash_executor).
+_hash_executor: Optional[ThreadPoolExecutor] = None
+# Slots for hash/verify computations in flight, held only while Argon2 runs
+_hashing_slots = asyncio.Semaphore(settings.password_hashing_max_concurrency)
+# Per-process key used to derive cache keys, so plain passwords never sit in memory
+_VERIFY_CACHE_SECRET = secrets.token_bytes(32)
+# LRU of successful verifications, keyed by HMAC(password, hash), valued by expiry
+_verified_passwords: OrderedDict[str, float] = OrderedDict()
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
-    Another cryptographic hashing algorithm could be used here,
-    but bcrypt is a widely adopted for password hashing.
+    Hash a password using Argon2id.
+    Argon2id is memory-hard, which makes GPU/ASIC attacks expensive while
+    keeping the CPU cost per hash lower than bcrypt or PBKDF2.
+
     Args:
         password: Plain text password
 
     Returns:
         Hashed password as string
     """
-    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    return _PASSWORD_HASHER.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
+    Legacy bcrypt hashes are still accepted so existing users can log in.
 
     Args:
         plain_password: Plain text password to verify
@@ -34,6 +66,142 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+    try:
+        return _PASSWORD_HASHER.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Tell whether a stored hash should be replaced after a successful login.
+
+    Args:
+        hashed_password: Hashed password from the database
+
+    Returns:
+        True for legacy bcrypt hashes and Argon2 hashes created with
+        different parameters than the current settings, False otherwise
+    """
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return True
+    return _PASSWORD_HASHER.check_needs_rehash(hashed_password)
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """
+    Get the password-hashing executor, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: Executor sized by settings.password_hashing_workers
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.password_hashing_workers,
+            thread_name_prefix="password-hash",
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """
+    Stop the password-hashing threads, waiting for in-flight hashes.
+    Called on application shutdown; a later hash call starts a new executor.
+    """
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+async def _run_hashing(func: Callable[..., _T], *args) -> _T:
+    """
+    Run a hash/verify function on the password-hashing executor.
+    A slot is held only for the computation itself; when every slot is in
+    use the call fails right away instead of queuing behind CPU-bound work.
+
+    Raises:
+        PasswordHashingBusyException: If all password-hashing slots are in use
+    """
+    if _hashing_slots.locked():
+        raise PasswordHashingBusyException()
+    async with _hashing_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password-hashing executor so the event loop is
+    not blocked. argon2-cffi releases the GIL while hashing, so other requests
+    keep being served during the computation.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password as string
+
+    Raises:
+        PasswordHashingBusyException: If all password-hashing slots are in use
+    """
+    return await _run_hashing(hash_password, password)
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> str:
+    """
+    Build the cache key for a (password, hash) pair.
+    The stored hash is part of the key, so a password change naturally
+    invalidates previous entries.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        Hex digest identifying the pair
+    """
+    message = f"{hashed_password}:{plain_password}".encode("utf-8")
+    return hmac.new(_VERIFY_CACHE_SECRET, message, hashlib.sha256).hexdigest()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash on the password-hashing executor.
+    Successful verifications are kept in a bounded in-memory LRU cache
+    for a short TTL, so repeated Basic Auth calls with the same credentials
+    (e.g. activation-code then activate) skip Argon2.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+
+    Raises:
+        PasswordHashingBusyException: If all password-hashing slots are in use
+    """
+    cache_key = _verify_cache_key(plain_password, hashed_password)
+    expires_at = _verified_passwords.get(cache_key)
+    if expires_at is not None:
+        if expires_at > time.monotonic():
+            _verified_passwords.move_to_end(cache_key)
+            return True
+        del _verified_passwords[cache_key]
+
+    is_valid = await _run_hashing(verify_password, plain_password, hashed_password)
+
+    if is_valid and settings.password_verify_cache_size > 0:
+        _verified_passwords[cache_key] = (
+            time.monotonic() + settings.password_verify_cache_ttl_seconds
+        )
+        if len(_verified_passwords) > settings.password_verify_cache_size:
+            _verified_passwords.popitem(last=False)
+
+    return is_valid
@@ -1,10 +1,27 @@
 import logging
 import tomllib
 
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_PYPROJECT_PATH = Path(__file__).parent.parent.parent / "pyproject.toml"
+
+
+@lru_cache(maxsize=1)
+def _load_poetry_tool_data() -> dict:
+    """
+    Read the [tool.poetry] section of pyproject.toml.
+    The file is parsed once and the result is cached for subsequent lookups.
+
+    Returns:
+        dict: The [tool.poetry] section, or an empty dict if it is missing.
+    """
+    with open(_PYPROJECT_PATH, "rb") as f:
+        pyproject_data = tomllib.load(f)
+    return pyproject_data.get("tool", {}).get("poetry", {})
+
 
 def _get_poetry_tool_element(element: str, default_element_value: str = "") -> str:
     """
@@ -20,20 +37,20 @@ def _get_poetry_tool_element(element: str, default_element_value: str = "") -> s
             if not found. Logs a warning if the element is not found in pyproject.toml.
             Handles exceptions gracefully and returns the default value in case of errors.
     """
-    pyproject_path = Path(__file__).parent.parent.parent / "pyproject.toml"
     try:
-        with open(pyproject_path, "rb") as f:
-            pyproject_data = tomllib.load(f)
-            poetry_tool_data = pyproject_data.get("tool", {}).get("poetry", {})
-            element = poetry_tool_data.get(element)
-            if not element:
-                logger.warning(
-                    f"'{element}' element not found in 'pyproject.toml' - returning default value"
-                )
-                return default_element_value
-            return element
+        value = _load_poetry_tool_data().get(element)
     except Exception as e:
         logger.warning(
-            f"Error reading 'pyproject.toml': {e} - returning default value for '{element}'"
+            "Error reading 'pyproject.toml': %s - returning default value for '%s'",
+            e,
+            element,
+        )
+        return default_element_value
+
+    if not value:
+        logger.warning(
+            "'%s' element not found in 'pyproject.toml' - returning default value",
+            element,
         )
         return default_element_value
+    return value
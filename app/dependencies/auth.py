@@ -0,0 +1,59 @@
+"""
+Authentication dependencies shared by the API endpoints.
+"""
+
+import logging
+from typing import Annotated
+
+from asyncpg import Record
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+
+from app.dependencies.deps import get_user_service
+from app.exceptions.security import PasswordHashingBusyException
+from app.exceptions.user import InvalidCredentialsException
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+security = HTTPBasic()
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    user_service: UserService = Depends(get_user_service),
+) -> Record:
+    """
+    Authenticate the request with HTTP Basic credentials (email:password).
+    FastAPI caches the result per request, so every dependency and endpoint
+    asking for the current user shares a single password verification.
+
+    Args:
+        credentials: HTTP Basic authentication credentials
+        user_service: User service Dependency
+
+    Returns:
+        Record: Authenticated user row
+
+    Raises:
+        HTTPException: 401 if the credentials are invalid, 429 if every
+            password-hashing slot is in use
+    """
+    try:
+        return await user_service.authenticate_user(
+            email=credentials.username, password=credentials.password
+        )
+    except InvalidCredentialsException as e:
+        logger.warning("Authentication failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    except PasswordHashingBusyException as e:
+        logger.warning("Authentication rejected: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message,
+            headers={"Retry-After": "1"},
+        )
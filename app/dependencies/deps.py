@@ -4,11 +4,13 @@ FastAPI dependencies for dependency injection.
 
 import httpx
 import asyncpg
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from app.core.config import settings
+from app.core.enums import Environment
 from app.db.pool import db_pool
 from app.repositories.user_repository import UserRepository
-from app.clients.mailpit_client import MailpitClient
+from app.clients.mailpit_client import MailpitClient, NullMailpitClient
 from app.services.email_service import EmailService
 from app.services.user_service import UserService
 
@@ -36,28 +38,57 @@ def get_user_repository(pool: asyncpg.Pool = Depends(get_db_pool)) -> UserReposi
     return UserRepository(pool)
 
 
-async def get_http_client() -> httpx.AsyncClient:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        yield client
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the application-wide HTTP client.
+    A single pooled client is shared across requests so connections to
+    external services are kept alive instead of re-established per call.
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP client
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.http_client_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.http_client_max_connections,
+            max_keepalive_connections=settings.http_client_max_keepalive_connections,
+        ),
+    )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client created at application startup.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        httpx.AsyncClient: Shared HTTP client
+    """
+    return request.app.state.http_client
 
 
 def get_mailpit_client(
     client: httpx.AsyncClient = Depends(get_http_client),
-) -> MailpitClient:
+) -> MailpitClient | NullMailpitClient:
     """
     Get Mailpit client instance.
+    Returns a no-op client when email sending is disabled outside production.
 
     Args:
         client: HTTP client for making requests
 
     Returns:
-        MailpitClient: Mailpit client instance
+        MailpitClient or NullMailpitClient: Mailpit client instance
     """
+    if settings.email_disabled and settings.environment != Environment.PRODUCTION.value:
+        return NullMailpitClient()
     return MailpitClient(client=client)
 
 
 def get_email_service(
-    mailpit_client: MailpitClient = Depends(get_mailpit_client),
+    mailpit_client: MailpitClient | NullMailpitClient = Depends(get_mailpit_client),
 ) -> EmailService:
     """
     Get email service instance.
@@ -0,0 +1,16 @@
+"""
+Security-related exception classes.
+"""
+
+from fastapi import status
+from app.exceptions.base import AppException
+
+
+class PasswordHashingBusyException(AppException):
+    """Raised when every password-hashing slot of the worker is in use."""
+
+    def __init__(self):
+        super().__init__(
+            message="Too many concurrent requests, please retry later",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
@@ -2,15 +2,70 @@
 User repository for database operations.
 """
 
-from typing import Optional
+from typing import Final, Optional
 
 import asyncpg
-import secrets
+import os
 
-from datetime import datetime, timedelta
 from uuid import UUID
 from app.core.config import settings
 
+# SQL statements are module constants so every call sends the identical string:
+# asyncpg keys its per-connection prepared statement cache on the query text,
+# so each statement is parsed/planned once per connection and then reused.
+SQL_CREATE_USER: Final = """
+    INSERT INTO users (email, hashed_password, is_active)
+    VALUES ($1, $2, FALSE)
+    ON CONFLICT ((LOWER(email))) DO NOTHING
+    RETURNING id, email, is_active, created_at
+"""
+
+SQL_GET_USER_BY_EMAIL: Final = """
+    SELECT u.id, u.email, u.hashed_password, u.is_active, u.created_at,
+           EXISTS (
+               SELECT 1 FROM activation_codes a WHERE a.user_id = u.id
+           ) AS has_activation_code
+    FROM users u
+    WHERE LOWER(u.email) = LOWER($1)
+"""
+
+SQL_UPDATE_HASHED_PASSWORD: Final = (
+    "UPDATE users SET hashed_password = $2 WHERE id = $1"
+)
+
+SQL_UPSERT_ACTIVATION_CODE: Final = """
+    INSERT INTO activation_codes (user_id, code, expires_at)
+    VALUES ($1, $2, NOW() + make_interval(secs => $3))
+    ON CONFLICT (user_id) DO UPDATE
+    SET code = EXCLUDED.code,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+"""
+
+# Consume a valid code and activate its user in one atomic statement
+SQL_ACTIVATE_WITH_CODE: Final = """
+    WITH consumed AS (
+        DELETE FROM activation_codes
+        WHERE user_id = $1
+        AND code = $2
+        AND expires_at > NOW()
+        RETURNING user_id
+    ),
+    activated AS (
+        UPDATE users
+        SET is_active = TRUE
+        WHERE id IN (SELECT user_id FROM consumed) AND is_active = FALSE
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT 1 FROM consumed)
+"""
+
+
+def _new_activation_code() -> str:
+    """Return a random 4-digit activation code (1000-9999)."""
+    # 32 random bits reduced modulo 9000 (bias ~2e-6, negligible)
+    return f"{int.from_bytes(os.urandom(4), 'big') % 9000 + 1000}"
+
 
 class UserRepository:
     """Repository for user-related database operations."""
@@ -18,155 +73,87 @@ class UserRepository:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def create_user(self, email: str, hashed_password: str) -> dict:
+    async def create_user(self, email: str, hashed_password: str) -> Optional[dict]:
         """
         Create a new user in the database.
+        Duplicate emails (case-insensitive) are skipped by the unique index
+        instead of raising, so the caller can detect them without a prior lookup.
 
         Args:
             email: User email
             hashed_password: Hashed password
 
         Returns:
-            dict: Created user data
-
-        Raises:
-            asyncpg.UniqueViolationError: If email already exists
-        """
-        query = """
-            INSERT INTO users (email, hashed_password, is_active)
-            VALUES ($1, $2, FALSE)
-            RETURNING id, email, is_active, created_at
+            dict or None: Created user data, None if the email already exists
         """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, email, hashed_password)
-            return dict(row)
+            row = await conn.fetchrow(SQL_CREATE_USER, email, hashed_password)
+            return dict(row) if row else None
 
-    async def get_user_by_email(self, email: str) -> Optional[dict]:
+    async def get_user_by_email(self, email: str) -> Optional[asyncpg.Record]:
         """
-        Get user by email.
+        Get user by email (case-insensitive, served by the LOWER(email) index).
+        Also reports whether the user has an activation code, so the
+        activation flow doesn't need a separate lookup.
 
         Args:
             email: User email
 
         Returns:
-            dict or None: User data if found, None otherwise
-        """
-        query = """
-            SELECT id, email, hashed_password, is_active, created_at
-            FROM users
-            WHERE email = $1
+            asyncpg.Record or None: User row (with ``has_activation_code``) if
+                found, None otherwise. Fields are read by name like a dict.
         """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, email)
-            return dict(row) if row else None
+            return await conn.fetchrow(SQL_GET_USER_BY_EMAIL, email)
 
-    async def create_activation_code(self, user_id: UUID) -> str:
+    async def update_hashed_password(self, user_id: UUID, hashed_password: str) -> None:
         """
-        Create an activation code for a user.
-        Deletes any existing codes for this user first.
+        Replace the stored password hash of a user.
 
         Args:
             user_id: User UUID
-
-        Returns:
-            str: The generated 4-digit code
+            hashed_password: New hashed password
         """
-        # Generate 4-digit code
-        code = f"{secrets.randbelow(9000) + 1000}"
-
-        # Calculate expiration time (1 minute from now)
-        expires_at = datetime.utcnow() + timedelta(
-            seconds=settings.activation_code_ttl_seconds
-        )
-
         async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                # Delete existing codes for this user
-                await conn.execute(
-                    "DELETE FROM activation_codes WHERE user_id = $1", user_id
-                )
-
-                # Insert new code
-                await conn.execute(
-                    """
-                    INSERT INTO activation_codes (user_id, code, expires_at)
-                    VALUES ($1, $2, $3)
-                    """,
-                    user_id,
-                    code,
-                    expires_at,
-                )
-
-        return code
+            await conn.execute(SQL_UPDATE_HASHED_PASSWORD, user_id, hashed_password)
 
-    async def verify_activation_code(self, user_id: UUID, code: str) -> bool:
+    async def create_activation_code(self, user_id: UUID) -> str:
         """
-        Verify an activation code for a user.
+        Create an activation code for a user.
+        Replaces any existing code for this user in a single statement.
 
         Args:
             user_id: User UUID
-            code: 4-digit activation code
 
         Returns:
-            bool: True if code is valid and not expired, False otherwise
-        """
-        query = """
-            SELECT id
-            FROM activation_codes
-            WHERE user_id = $1 
-            AND code = $2 
-            AND expires_at > NOW()
-        """
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, user_id, code)
-            return row is not None
-
-    async def delete_activation_code(self, user_id: UUID) -> None:
+            str: The generated 4-digit code
         """
-        Delete activation code(s) for a user.
+        code = _new_activation_code()
 
-        Args:
-            user_id: User UUID
-        """
-        query = "DELETE FROM activation_codes WHERE user_id = $1"
+        # One code per user (unique user_id): upsert instead of DELETE + INSERT
         async with self.pool.acquire() as conn:
-            await conn.execute(query, user_id)
+            # Expiration (1 minute by default) is computed from the database clock
+            await conn.execute(
+                SQL_UPSERT_ACTIVATION_CODE,
+                user_id,
+                code,
+                settings.activation_code_ttl_seconds,
+            )
 
-    async def has_activation_code(self, user_id: UUID) -> bool:
-        """
-        Check if user has an activation code.
-
-        Args:
-            user_id: User UUID
-
-        Returns:
-            bool: True if user has an activation code, False otherwise
-        """
-        query = """
-            SELECT id
-            FROM activation_codes
-            WHERE user_id = $1
-        """
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, user_id)
-            return row is not None
+        return code
 
-    async def activate_user(self, user_id: UUID) -> bool:
+    async def activate_with_code(self, user_id: UUID, code: str) -> bool:
         """
-        Activate a user account.
+        Activate a user with an activation code.
+        The code is checked, consumed and the user activated in a single
+        statement, so a code can never be used twice.
 
         Args:
             user_id: User UUID
+            code: 4-digit activation code
 
         Returns:
-            bool: True if user was activated, False otherwise
-        """
-        query = """
-            UPDATE users
-            SET is_active = TRUE
-            WHERE id = $1 AND is_active = FALSE
-            RETURNING id
+            bool: True if the code was valid and not expired, False otherwise
         """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, user_id)
-            return row is not None
+            return await conn.fetchval(SQL_ACTIVATE_WITH_CODE, user_id, code)
@@ -6,7 +6,7 @@ Uses MailpitClient for actual HTTP communication.
 import logging
 
 from app.core.config import settings
-from app.clients.mailpit_client import MailpitClient
+from app.clients.mailpit_client import MailpitClient, NullMailpitClient
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,7 @@ class EmailService:
     Delegates HTTP communication to MailpitClient.
     """
 
-    def __init__(self, mailpit_client: MailpitClient):
+    def __init__(self, mailpit_client: MailpitClient | NullMailpitClient):
         """
         Initialize the email service.
 
@@ -39,7 +39,7 @@ class EmailService:
         """
         ttl_minutes = settings.activation_code_ttl_seconds / 60
 
-        logger.info(f"Sending activation code {code} to {to_email}")
+        logger.info("Sending activation code %s to %s", code, to_email)
 
         subject = "Your Activation Code"
         text_body = self._build_text_body(ttl_minutes=ttl_minutes, code=code)
@@ -53,9 +53,9 @@ class EmailService:
         )
 
         if success:
-            logger.info(f"Activation code email sent successfully to {to_email}")
+            logger.info("Activation code email sent successfully to %s", to_email)
         else:
-            logger.error(f"Failed to send activation code email to {to_email}")
+            logger.error("Failed to send activation code email to %s", to_email)
 
         return success
 
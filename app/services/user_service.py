@@ -5,12 +5,16 @@ User service containing business logic.
 import logging
 from uuid import UUID
 
-from asyncpg.exceptions import UniqueViolationError
+from asyncpg import Record
 from fastapi import BackgroundTasks
 
 from app.core.config import settings
 from app.repositories.user_repository import UserRepository
-from app.core.security import hash_password, verify_password
+from app.core.security import (
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 from app.exceptions.user import (
     UserAlreadyExistsException,
     UserAlreadyActivatedException,
@@ -47,32 +51,30 @@ class UserService:
         Raises:
             UserAlreadyExistsException: If email already exists
         """
-        try:
-            # Hash password
-            hashed_password = hash_password(password=password)
+        # Hash password
+        hashed_password = await hash_password_async(password=password)
 
-            # Create user
-            user = await self.user_repository.create_user(
-                email=email, hashed_password=hashed_password
-            )
-
-            # Schedule activation code generation and sending in background (non-blocking)
-            if settings.send_activation_code_on_registration:
-                logger.info(f"Scheduling activation code to be sent to {email}")
-                background_tasks.add_task(
-                    self._generate_and_send_activation_code,
-                    user_id=user["id"],
-                    email=email,
-                )
+        # Create user (single round-trip, None when the email is already taken)
+        user = await self.user_repository.create_user(
+            email=email, hashed_password=hashed_password
+        )
+        if user is None:
+            logger.warning("Registration failed: email %s already exists", email)
+            raise UserAlreadyExistsException(email=email)
 
-            logger.info(f"User registered: {email}")
-            return user
+        # Schedule activation code generation and sending in background (non-blocking)
+        if settings.send_activation_code_on_registration:
+            logger.info("Scheduling activation code to be sent to %s", email)
+            background_tasks.add_task(
+                self._generate_and_send_activation_code,
+                user_id=user["id"],
+                email=email,
+            )
 
-        except UniqueViolationError:
-            logger.warning(f"Registration failed: email {email} already exists")
-            raise UserAlreadyExistsException(email=email)
+        logger.info("User registered: %s", email)
+        return user
 
-    async def authenticate_user(self, email: str, password: str) -> dict:
+    async def authenticate_user(self, email: str, password: str) -> Record:
         """
         Authenticate a user with email and password.
 
@@ -81,7 +83,7 @@ class UserService:
             password: Plain text password
 
         Returns:
-            dict: User data if authentication successful
+            Record: User row if authentication successful
 
         Raises:
             InvalidCredentialsException: If credentials are invalid
@@ -89,14 +91,22 @@ class UserService:
         user = await self.user_repository.get_user_by_email(email)
 
         if not user:
-            logger.warning(f"Authentication failed: user {email} not found")
+            logger.warning("Authentication failed: user %s not found", email)
             raise InvalidCredentialsException()
 
-        if not verify_password(password, user["hashed_password"]):
-            logger.warning(f"Authentication failed: invalid password for {email}")
+        if not await verify_password_async(password, user["hashed_password"]):
+            logger.warning("Authentication failed: invalid password for %s", email)
             raise InvalidCredentialsException()
 
-        logger.info(f"User authenticated: {email}")
+        # Transparently migrate legacy bcrypt (or outdated Argon2) hashes
+        if needs_rehash(user["hashed_password"]):
+            hashed_password = await hash_password_async(password=password)
+            await self.user_repository.update_hashed_password(
+                user["id"], hashed_password
+            )
+            logger.info("Password hash upgraded for %s", email)
+
+        logger.info("User authenticated: %s", email)
         return user
 
     async def _generate_and_send_activation_code(
@@ -113,43 +123,42 @@ class UserService:
         try:
             # Generate activation code
             code = await self.user_repository.create_activation_code(user_id)
-            logger.info(f"Activation code generated for user {email}")
+            logger.info("Activation code generated for user %s", email)
 
             # Send email with code
             await self.email_service.send_activation_code(
                 to_email=email,
                 code=code,
             )
-            logger.info(f"Activation code sent to {email}")
+            logger.info("Activation code sent to %s", email)
 
         except Exception as e:
             logger.error(
-                f"Failed to generate or send activation code for {email}: {e}",
+                "Failed to generate or send activation code for %s: %s",
+                email,
+                e,
                 exc_info=True,
             )
 
     async def request_activation_code(
-        self, email: str, password: str, background_tasks: BackgroundTasks
+        self, user: Record, background_tasks: BackgroundTasks
     ) -> None:
         """
         Generate and send activation code to user.
 
         Args:
-            email: User email
-            password: Plain text password
+            user: Authenticated user data
             background_tasks: Background tasks
 
         Raises:
-            InvalidCredentialsException: If credentials are invalid
             UserAlreadyActivatedException: If user is already activated
         """
-        # Authenticate user
-        user = await self.authenticate_user(email=email, password=password)
+        email = user["email"]
 
         # Check if already activated
         if user["is_active"]:
             logger.warning(
-                f"Activation code request failed: user {email} already activated"
+                "Activation code request failed: user %s already activated", email
             )
             raise UserAlreadyActivatedException()
 
@@ -160,46 +169,36 @@ class UserService:
             email=email,
         )
 
-    async def activate_user(self, email: str, password: str, code: str) -> None:
+    async def activate_user(self, user: Record, code: str) -> None:
         """
         Activate a user account with the provided code.
 
         Args:
-            email: User email
-            password: Plain text password
+            user: Authenticated user data
             code: 4-digit activation code
 
         Raises:
-            InvalidCredentialsException: If credentials are invalid
             UserAlreadyActivatedException: If user is already activated
             NoActivationCodeException: If no activation code exists
             InvalidActivationCodeException: If code is invalid or expired
         """
-        # Authenticate user
-        user = await self.authenticate_user(email=email, password=password)
+        email = user["email"]
 
         # Check if already activated
         if user["is_active"]:
-            logger.warning(f"Activation failed: user {email} already activated")
+            logger.warning("Activation failed: user %s already activated", email)
             raise UserAlreadyActivatedException()
 
-        # Check if activation code exists
-        has_code = await self.user_repository.has_activation_code(user["id"])
-        if not has_code:
-            logger.warning(f"Activation failed: no code for user {email}")
+        # Check if activation code exists (fetched along with the user)
+        if not user["has_activation_code"]:
+            logger.warning("Activation failed: no code for user %s", email)
             raise NoActivationCodeException()
 
-        # Verify activation code
-        is_valid = await self.user_repository.verify_activation_code(user["id"], code)
+        # Verify the code, activate the user and consume the code in one round-trip
+        is_valid = await self.user_repository.activate_with_code(user["id"], code)
 
         if not is_valid:
-            logger.warning(f"Activation failed: invalid or expired code for {email}")
+            logger.warning("Activation failed: invalid or expired code for %s", email)
             raise InvalidActivationCodeException()
 
-        # Activate user
-        await self.user_repository.activate_user(user["id"])
-
-        # Delete activation code
-        await self.user_repository.delete_activation_code(user["id"])
-
-        logger.info(f"User activated: {email}")
+        logger.info("User activated: %s", email)
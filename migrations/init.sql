@@ -25,7 +25,9 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 -- Activation codes table: Temporary 4-digit codes with 1-minute TTL
-CREATE TABLE IF NOT EXISTS activation_codes (
+-- UNLOGGED: short-lived data, skips WAL writes (table is emptied after a crash,
+-- users simply request a new code)
+CREATE UNLOGGED TABLE IF NOT EXISTS activation_codes (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     code VARCHAR(4) NOT NULL,
@@ -60,13 +62,11 @@ CREATE INDEX IF NOT EXISTS idx_users_created_at
 -- ----------------------------------------
 
 -- Unique constraint: One active code per user (prevents duplicate codes)
+-- Also serves activation validation: user_id matches at most one row, so a
+-- (user_id, code) composite index would only add write cost to every upsert
 CREATE UNIQUE INDEX IF NOT EXISTS idx_activation_codes_user_id_unique
     ON activation_codes(user_id);
 
--- Composite index for activation validation (most common query)
-CREATE INDEX IF NOT EXISTS idx_activation_codes_user_code
-    ON activation_codes(user_id, code);
-
 -- Index for cleanup queries (sorting by expiration)
 CREATE INDEX IF NOT EXISTS idx_activation_codes_expires_at
     ON activation_codes(expires_at);
@@ -2,29 +2,35 @@
 Test configuration and fixtures.
 """
 
-import asyncio
+import base64
 import pytest
 import pytest_asyncio
-from typing import AsyncGenerator
+import uvloop
+from typing import AsyncGenerator, Callable
 from httpx import AsyncClient, ASGITransport
 
 from app.main import app
 from app.db.pool import db_pool
+from app.core.config import settings
+from app.core.security import hash_password
+from app.dependencies.deps import create_http_client
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest.fixture(scope="session")
+def event_loop_policy() -> uvloop.EventLoopPolicy:
+    """
+    Run the test session on uvloop, the loop uvicorn picks in production.
+    """
+    return uvloop.EventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="session")
 async def setup_database() -> AsyncGenerator:
     """
     Setup database connection pool for testing.
-    Reconnects for each test to avoid event loop issues.
+    A single pool is shared by the whole session (all tests run on the
+    session event loop, see pyproject.toml), so connections are opened once.
     """
-    # Ensure pool is closed first
-    try:
-        await db_pool.close()
-    except:
-        pass
-
-    # Connect to database
     await db_pool.connect()
     yield
 
@@ -40,21 +46,83 @@ async def clean_database(setup_database):
     """
     # Clean up before test
     async with db_pool.get_pool().acquire() as conn:
-        await conn.execute("DELETE FROM activation_codes")
-        await conn.execute("DELETE FROM users")
+        await conn.execute("TRUNCATE activation_codes, users")
 
     yield
 
     # Clean up after test
     async with db_pool.get_pool().acquire() as conn:
-        await conn.execute("DELETE FROM activation_codes")
-        await conn.execute("DELETE FROM users")
+        await conn.execute("TRUNCATE activation_codes, users")
 
 
 @pytest_asyncio.fixture
-async def client() -> AsyncGenerator[AsyncClient, None]:
-    """Create an async test client for the FastAPI application."""
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        yield ac
+async def client(monkeypatch) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Create an async test client for the FastAPI application.
+    Email retries run without backoff, so a missing Mailpit does not add real
+    sleeps to background tasks.
+    """
+    monkeypatch.setattr(settings, "email_api_retry_backoff_seconds", 0)
+    async with create_http_client() as http_client:
+        app.state.http_client = http_client
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            yield ac
+
+
+@pytest.fixture(scope="session")
+def basic_auth() -> Callable[[str, str], dict]:
+    """
+    Build HTTP Basic Auth headers, encoding each email/password pair once.
+
+    Returns:
+        Callable returning the Authorization header for (email, password).
+    """
+    cache: dict[tuple[str, str], dict] = {}
+
+    def make(email: str, password: str) -> dict:
+        key = (email, password)
+        if key not in cache:
+            encoded = base64.b64encode(f"{email}:{password}".encode()).decode()
+            cache[key] = {"Authorization": f"Basic {encoded}"}
+        return cache[key]
+
+    return make
+
+
+TEST_USER_EMAIL = "test@example.com"
+TEST_USER_PASSWORD = "SecurePass123"
+
+
+@pytest.fixture(scope="session")
+def test_user_hashed_password() -> str:
+    """
+    Hash the shared test password once per session.
+    """
+    return hash_password(TEST_USER_PASSWORD)
+
+
+@pytest_asyncio.fixture
+async def registered_user(clean_database, test_user_hashed_password) -> dict:
+    """
+    Insert an inactive user straight into the database.
+
+    Tests that are not about registration use this instead of calling
+    /register, which would spend a full password hash per test.
+
+    Returns:
+        Dict with the user's id, email and plain password.
+    """
+    async with db_pool.get_pool().acquire() as conn:
+        user_id = await conn.fetchval(
+            """
+            INSERT INTO users (email, hashed_password, is_active)
+            VALUES ($1, $2, FALSE)
+            RETURNING id
+            """,
+            TEST_USER_EMAIL,
+            test_user_hashed_password,
+        )
+
+    return {"id": user_id, "email": TEST_USER_EMAIL, "password": TEST_USER_PASSWORD}
@@ -1,15 +1,53 @@
-from fastapi.testclient import TestClient
-from app.main import app
+import pytest
+from httpx import AsyncClient
+
 from app.core.config import settings
 
-client = TestClient(app)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", ["/", "/health"])
+async def test_health_endpoints(client: AsyncClient, url: str):
+    response = await client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "operational"
+    assert data["message"] == settings.app_description
+    assert data["version"] == settings.app_version
+    assert response.headers["content-type"] == "application/json"
 
 
-def test_health_endpoints_sync():
+@pytest.mark.asyncio
+async def test_health_endpoints_documented_in_openapi(client: AsyncClient):
+    schema = (await client.get("/openapi.json")).json()
     for url in ["/", "/health"]:
-        response = client.get(url)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "operational"
-        assert data["message"] == settings.app_description
-        assert data["version"] == settings.app_version
+        response_schema = schema["paths"][url]["get"]["responses"]["200"]
+        assert response_schema["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/HealthResponse"
+        }
+
+
+@pytest.mark.asyncio
+async def test_cors_preflight_allowed_origin(client: AsyncClient):
+    origin = settings.cors_origins[0]
+    response = await client.options(
+        "/health",
+        headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == origin
+    assert response.headers["access-control-max-age"] == str(settings.cors_max_age)
+
+
+@pytest.mark.asyncio
+async def test_cors_preflight_unknown_origin_rejected(client: AsyncClient):
+    response = await client.options(
+        "/health",
+        headers={
+            "Origin": "http://evil.example.com",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert response.status_code == 400
@@ -5,11 +5,14 @@ Tests the full flow of user registration, activation code request,
 and account activation through the API endpoints.
 """
 
-import base64
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
+from app.core import security
 from app.db.pool import db_pool
+from app.services.user_service import UserService
 
 
 class TestUserRegistration:
@@ -82,27 +85,92 @@ class TestUserRegistration:
         assert response.status_code == 422
 
 
+class TestPasswordHashingLimit:
+    """Test cases for the per-worker password-hashing slots."""
+
+    @pytest.mark.asyncio
+    async def test_background_task_does_not_hold_hashing_slot(
+        self, client: AsyncClient, clean_database, monkeypatch
+    ):
+        """Test that queued activation emails run after the slot is released."""
+        monkeypatch.setattr(security, "_hashing_slots", asyncio.Semaphore(1))
+        slot_locked_in_background = []
+
+        async def record_slot(self, user_id, email):
+            slot_locked_in_background.append(security._hashing_slots.locked())
+
+        monkeypatch.setattr(
+            UserService, "_generate_and_send_activation_code", record_slot
+        )
+
+        response = await client.post(
+            "/api/v1/users/register",
+            json={"email": "test@example.com", "password": "SecurePass123"},
+        )
+
+        assert response.status_code == 201
+        assert slot_locked_in_background == [False]
+
+    @pytest.mark.asyncio
+    async def test_register_rejected_when_hashing_slots_busy(
+        self, client: AsyncClient, clean_database, monkeypatch
+    ):
+        """Test that registration gets a 429 while every slot is in use."""
+        slots = asyncio.Semaphore(1)
+        monkeypatch.setattr(security, "_hashing_slots", slots)
+
+        async with slots:
+            response = await client.post(
+                "/api/v1/users/register",
+                json={"email": "test@example.com", "password": "SecurePass123"},
+            )
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+
+
+async def _set_activation_code(user_id, code: str, expired: bool = False) -> None:
+    """Replace the user's activation code with a known one."""
+    if expired:
+        created_at, expires_at = (
+            "NOW() - INTERVAL '2 minutes'",
+            "NOW() - INTERVAL '1 minute'",
+        )
+    else:
+        created_at, expires_at = "NOW()", "NOW() + INTERVAL '1 minute'"
+
+    async with db_pool.get_pool().acquire() as conn:
+        await conn.execute(
+            f"""
+            INSERT INTO activation_codes (user_id, code, created_at, expires_at)
+            VALUES ($1, $2, {created_at}, {expires_at})
+            ON CONFLICT (user_id) DO UPDATE
+            SET code = EXCLUDED.code,
+                created_at = EXCLUDED.created_at,
+                expires_at = EXCLUDED.expires_at
+            """,
+            user_id,
+            code,
+        )
+
+
+async def _activate_in_database(email: str) -> None:
+    """Mark the user as active without going through the API."""
+    async with db_pool.get_pool().acquire() as conn:
+        await conn.execute("UPDATE users SET is_active = TRUE WHERE email = $1", email)
+
+
 class TestActivationCodeRequest:
     """Test cases for activation code request endpoint."""
 
-    def _get_basic_auth_header(self, email: str, password: str) -> dict:
-        """Generate Basic Auth header."""
-        credentials = f"{email}:{password}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        return {"Authorization": f"Basic {encoded}"}
-
     @pytest.mark.asyncio
     async def test_request_activation_code_success(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test successful activation code request."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
+        email = registered_user["email"]
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(email, registered_user["password"])
         response = await client.post("/api/v1/users/activation-code", headers=headers)
 
         assert response.status_code == 200
@@ -111,29 +179,37 @@ class TestActivationCodeRequest:
         assert email in data["message"]
 
     @pytest.mark.asyncio
-    async def test_request_activation_code_invalid_credentials(
-        self, client: AsyncClient, clean_database
+    async def test_request_activation_code_email_case_insensitive(
+        self, client: AsyncClient, clean_database, basic_auth
     ):
-        """Test activation code request with invalid credentials."""
-        email = "test@example.com"
+        """Test that the Basic Auth email matches regardless of case."""
         password = "SecurePass123"
         await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
+            "/api/v1/users/register",
+            json={"email": "Test@Example.com", "password": password},
         )
 
-        headers = self._get_basic_auth_header(email, "WrongPassword")
+        headers = basic_auth("test@example.com", password)
+        response = await client.post("/api/v1/users/activation-code", headers=headers)
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_request_activation_code_invalid_credentials(
+        self, client: AsyncClient, registered_user, basic_auth
+    ):
+        """Test activation code request with invalid credentials."""
+        headers = basic_auth(registered_user["email"], "WrongPassword")
         response = await client.post("/api/v1/users/activation-code", headers=headers)
 
         assert response.status_code == 401
 
     @pytest.mark.asyncio
     async def test_request_activation_code_nonexistent_user(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, clean_database, basic_auth
     ):
         """Test activation code request for non-existent user."""
-        headers = self._get_basic_auth_header(
-            "nonexistent@example.com", "SomePassword123"
-        )
+        headers = basic_auth("nonexistent@example.com", "SomePassword123")
         response = await client.post("/api/v1/users/activation-code", headers=headers)
 
         assert response.status_code == 401
@@ -149,21 +225,12 @@ class TestActivationCodeRequest:
 
     @pytest.mark.asyncio
     async def test_request_activation_code_already_activated(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test activation code request for already activated user."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-
-        async with db_pool.get_pool().acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET is_active = TRUE WHERE email = $1", email
-            )
+        await _activate_in_database(registered_user["email"])
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(registered_user["email"], registered_user["password"])
         response = await client.post("/api/v1/users/activation-code", headers=headers)
 
         assert response.status_code == 400
@@ -173,38 +240,17 @@ class TestActivationCodeRequest:
 class TestUserActivation:
     """Test cases for user activation endpoint."""
 
-    def _get_basic_auth_header(self, email: str, password: str) -> dict:
-        """Generate Basic Auth header."""
-        credentials = f"{email}:{password}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        return {"Authorization": f"Basic {encoded}"}
-
     @pytest.mark.asyncio
-    async def test_activate_user_success(self, client: AsyncClient, clean_database):
+    async def test_activate_user_success(
+        self, client: AsyncClient, registered_user, basic_auth
+    ):
         """Test successful user activation with valid code."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        response = await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-        user_id = response.json()["id"]
-
+        email = registered_user["email"]
+        user_id = registered_user["id"]
         test_code = "1234"
-        async with db_pool.get_pool().acquire() as conn:
-            # Delete auto-generated activation code first
-            await conn.execute(
-                "DELETE FROM activation_codes WHERE user_id = $1", user_id
-            )
-            await conn.execute(
-                """
-                INSERT INTO activation_codes (user_id, code, expires_at)
-                VALUES ($1, $2, NOW() + INTERVAL '1 minute')
-                """,
-                user_id,
-                test_code,
-            )
+        await _set_activation_code(user_id, test_code)
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(email, registered_user["password"])
         response = await client.post(
             "/api/v1/users/activate", json={"code": test_code}, headers=headers
         )
@@ -218,34 +264,19 @@ class TestUserActivation:
                 "SELECT is_active FROM users WHERE email = $1", email
             )
             assert result["is_active"] is True
+            remaining_codes = await conn.fetchval(
+                "SELECT COUNT(*) FROM activation_codes WHERE user_id = $1", user_id
+            )
+            assert remaining_codes == 0
 
     @pytest.mark.asyncio
     async def test_activate_user_invalid_code(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test user activation with invalid code."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        response = await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-        user_id = response.json()["id"]
+        await _set_activation_code(registered_user["id"], "1234")
 
-        async with db_pool.get_pool().acquire() as conn:
-            # Delete auto-generated activation code first
-            await conn.execute(
-                "DELETE FROM activation_codes WHERE user_id = $1", user_id
-            )
-            await conn.execute(
-                """
-                INSERT INTO activation_codes (user_id, code, expires_at)
-                VALUES ($1, $2, NOW() + INTERVAL '1 minute')
-                """,
-                user_id,
-                "1234",
-            )
-
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(registered_user["email"], registered_user["password"])
         response = await client.post(
             "/api/v1/users/activate", json={"code": "9999"}, headers=headers
         )
@@ -255,33 +286,13 @@ class TestUserActivation:
 
     @pytest.mark.asyncio
     async def test_activate_user_expired_code(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test user activation with expired code."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        response = await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-        user_id = response.json()["id"]
-
         test_code = "1234"
-        async with db_pool.get_pool().acquire() as conn:
-            # Delete auto-generated activation code first
-            await conn.execute(
-                "DELETE FROM activation_codes WHERE user_id = $1", user_id
-            )
-            # Insert code with created_at in the past and expires_at also in the past
-            await conn.execute(
-                """
-                INSERT INTO activation_codes (user_id, code, created_at, expires_at)
-                VALUES ($1, $2, NOW() - INTERVAL '2 minutes', NOW() - INTERVAL '1 minute')
-                """,
-                user_id,
-                test_code,
-            )
+        await _set_activation_code(registered_user["id"], test_code, expired=True)
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(registered_user["email"], registered_user["password"])
         response = await client.post(
             "/api/v1/users/activate", json={"code": test_code}, headers=headers
         )
@@ -290,16 +301,10 @@ class TestUserActivation:
 
     @pytest.mark.asyncio
     async def test_activate_user_invalid_code_format(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test activation with invalid code format."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(registered_user["email"], registered_user["password"])
 
         response = await client.post(
             "/api/v1/users/activate", json={"code": "abcd"}, headers=headers
@@ -318,37 +323,14 @@ class TestUserActivation:
 
     @pytest.mark.asyncio
     async def test_activate_user_already_activated(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test activation of already activated user."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        response = await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-        user_id = response.json()["id"]
-
-        async with db_pool.get_pool().acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET is_active = TRUE WHERE email = $1", email
-            )
-
+        await _activate_in_database(registered_user["email"])
         test_code = "1234"
-        async with db_pool.get_pool().acquire() as conn:
-            # Delete auto-generated activation code first
-            await conn.execute(
-                "DELETE FROM activation_codes WHERE user_id = $1", user_id
-            )
-            await conn.execute(
-                """
-                INSERT INTO activation_codes (user_id, code, expires_at)
-                VALUES ($1, $2, NOW() + INTERVAL '1 minute')
-                """,
-                user_id,
-                test_code,
-            )
+        await _set_activation_code(registered_user["id"], test_code)
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(registered_user["email"], registered_user["password"])
         response = await client.post(
             "/api/v1/users/activate", json={"code": test_code}, headers=headers
         )
@@ -365,16 +347,10 @@ class TestUserActivation:
 
     @pytest.mark.asyncio
     async def test_activate_user_wrong_credentials(
-        self, client: AsyncClient, clean_database
+        self, client: AsyncClient, registered_user, basic_auth
     ):
         """Test activation with wrong credentials."""
-        email = "test@example.com"
-        password = "SecurePass123"
-        await client.post(
-            "/api/v1/users/register", json={"email": email, "password": password}
-        )
-
-        headers = self._get_basic_auth_header(email, "WrongPassword")
+        headers = basic_auth(registered_user["email"], "WrongPassword")
         response = await client.post(
             "/api/v1/users/activate", json={"code": "1234"}, headers=headers
         )
@@ -385,14 +361,10 @@ class TestUserActivation:
 class TestUserFlowIntegration:
     """Test complete user registration and activation flow."""
 
-    def _get_basic_auth_header(self, email: str, password: str) -> dict:
-        """Generate Basic Auth header."""
-        credentials = f"{email}:{password}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        return {"Authorization": f"Basic {encoded}"}
-
     @pytest.mark.asyncio
-    async def test_complete_user_flow(self, client: AsyncClient, clean_database):
+    async def test_complete_user_flow(
+        self, client: AsyncClient, clean_database, basic_auth
+    ):
         """Test complete flow: register -> request code -> activate."""
         email = "flow@example.com"
         password = "SecurePass123"
@@ -404,7 +376,7 @@ class TestUserFlowIntegration:
         user_data = response.json()
         assert user_data["is_active"] is False
 
-        headers = self._get_basic_auth_header(email, password)
+        headers = basic_auth(email, password)
         response = await client.post("/api/v1/users/activation-code", headers=headers)
         assert response.status_code == 200
 
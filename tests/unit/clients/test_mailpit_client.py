@@ -3,16 +3,72 @@ Unit tests for MailpitClient.
 """
 
 import pytest
+import pytest_asyncio
 import httpx
-from unittest.mock import AsyncMock, MagicMock, patch
+import orjson
+from unittest.mock import ANY, AsyncMock, patch
 
-from app.clients.mailpit_client import MailpitClient
+from app.clients.mailpit_client import MailpitClient, NullMailpitClient
+from app.core.config import settings
+
+
+def _sent_payload(mock_http_client) -> dict:
+    """Decode the JSON body passed to the mocked ``post`` call."""
+    return orjson.loads(mock_http_client.post.call_args.kwargs["content"])
+
+
+@pytest_asyncio.fixture
+async def transport_client():
+    """
+    Factory for real AsyncClients whose transport replays ``outcomes`` in order.
+    Exceptions are raised, responses are returned; the last one repeats.
+    Each request is appended to ``requests``. Clients are closed on teardown.
+    """
+    clients = []
+
+    def make(requests: list, *outcomes) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            outcome = outcomes[min(len(requests), len(outcomes)) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    yield make
+
+    for client in clients:
+        await client.aclose()
+
+
+BASE_PAYLOAD = {
+    "From": {"Email": settings.from_email, "Name": settings.from_name},
+    "To": [{"Email": "test@example.com"}],
+    "Subject": "Test Subject",
+    "Text": "Test body",
+}
 
 
 @pytest.fixture
 def mock_http_client():
-    """Create a mock HTTP client for testing."""
-    return AsyncMock(spec=httpx.AsyncClient)
+    """Create a mock HTTP client whose POST succeeds."""
+    client = AsyncMock()
+    client.post.return_value = httpx.Response(
+        200, request=httpx.Request("POST", settings.email_api_url)
+    )
+    return client
+
+
+@pytest.fixture
+def mock_sleep():
+    """Skip the retry backoff delays."""
+    with patch(
+        "app.clients.mailpit_client.asyncio.sleep", new_callable=AsyncMock
+    ) as mock:
+        yield mock
 
 
 @pytest.fixture
@@ -24,38 +80,25 @@ def mailpit_client(mock_http_client):
 @pytest.mark.asyncio
 async def test_send_email_success(mailpit_client, mock_http_client):
     """Test successful email sending."""
-    # Arrange
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-    mock_http_client.post = AsyncMock(return_value=mock_response)
-
-    # Act
     result = await mailpit_client.send_email(
         to_email="test@example.com",
         subject="Test Subject",
         text_body="Test body",
     )
 
-    # Assert
     assert result is True
-    mock_http_client.post.assert_awaited_once()
-    call_args = mock_http_client.post.call_args
-    assert call_args.kwargs["json"]["To"][0]["Email"] == "test@example.com"
-    assert call_args.kwargs["json"]["Subject"] == "Test Subject"
-    assert call_args.kwargs["json"]["Text"] == "Test body"
+    mock_http_client.post.assert_awaited_once_with(
+        settings.email_api_url,
+        content=ANY,
+        headers={"Content-Type": "application/json"},
+        timeout=settings.email_api_timeout,
+    )
+    assert _sent_payload(mock_http_client) == BASE_PAYLOAD
 
 
 @pytest.mark.asyncio
 async def test_send_email_with_html(mailpit_client, mock_http_client):
     """Test sending email with HTML body."""
-    # Arrange
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-    mock_http_client.post = AsyncMock(return_value=mock_response)
-
-    # Act
     result = await mailpit_client.send_email(
         to_email="test@example.com",
         subject="Test Subject",
@@ -63,42 +106,78 @@ async def test_send_email_with_html(mailpit_client, mock_http_client):
         html_body="<h1>Test HTML</h1>",
     )
 
-    # Assert
     assert result is True
-    call_args = mock_http_client.post.call_args
-    assert call_args.kwargs["json"]["HTML"] == "<h1>Test HTML</h1>"
+    assert _sent_payload(mock_http_client) == {
+        **BASE_PAYLOAD,
+        "HTML": "<h1>Test HTML</h1>",
+    }
 
 
 @pytest.mark.asyncio
 async def test_send_email_with_custom_from(mailpit_client, mock_http_client):
     """Test sending email with custom from email and name."""
+    result = await mailpit_client.send_email(
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
+        from_email="custom@example.com",
+        from_name="Custom Sender",
+    )
+
+    assert result is True
+    assert _sent_payload(mock_http_client) == {
+        **BASE_PAYLOAD,
+        "From": {"Email": "custom@example.com", "Name": "Custom Sender"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_send_email_with_custom_from_name_only(mailpit_client, mock_http_client):
+    """Test that a partial sender override keeps the default sender email."""
+    result = await mailpit_client.send_email(
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
+        from_name="Custom Sender",
+    )
+
+    assert result is True
+    assert _sent_payload(mock_http_client) == {
+        **BASE_PAYLOAD,
+        "From": {"Email": settings.from_email, "Name": "Custom Sender"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_send_email_connect_timeout(mock_sleep, transport_client):
+    """Test that a connect timeout is retried."""
     # Arrange
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-    mock_http_client.post = AsyncMock(return_value=mock_response)
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, httpx.ConnectTimeout("Timeout"))
+    )
 
     # Act
     result = await mailpit_client.send_email(
         to_email="test@example.com",
         subject="Test Subject",
         text_body="Test body",
-        from_email="custom@example.com",
-        from_name="Custom Sender",
     )
 
     # Assert
-    assert result is True
-    call_args = mock_http_client.post.call_args
-    assert call_args.kwargs["json"]["From"]["Email"] == "custom@example.com"
-    assert call_args.kwargs["json"]["From"]["Name"] == "Custom Sender"
+    assert result is False
+    assert len(requests) == settings.email_api_max_retries + 1
+    assert mock_sleep.await_count == settings.email_api_max_retries
 
 
 @pytest.mark.asyncio
-async def test_send_email_timeout(mailpit_client, mock_http_client):
-    """Test email sending with timeout exception."""
+async def test_send_email_read_timeout_not_retried(mock_sleep, transport_client):
+    """Test that a read timeout is not retried, Mailpit may have sent the email."""
     # Arrange
-    mock_http_client.post = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, httpx.ReadTimeout("Timeout"))
+    )
 
     # Act
     result = await mailpit_client.send_email(
@@ -109,15 +188,17 @@ async def test_send_email_timeout(mailpit_client, mock_http_client):
 
     # Assert
     assert result is False
-    mock_http_client.post.assert_awaited_once()
+    assert len(requests) == 1
+    mock_sleep.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_send_email_connection_error(mailpit_client, mock_http_client):
+async def test_send_email_connection_error(mock_sleep, transport_client):
     """Test email sending with connection error."""
     # Arrange
-    mock_http_client.post = AsyncMock(
-        side_effect=httpx.ConnectError("Connection failed")
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, httpx.ConnectError("Connection failed"))
     )
 
     # Act
@@ -129,21 +210,64 @@ async def test_send_email_connection_error(mailpit_client, mock_http_client):
 
     # Assert
     assert result is False
-    mock_http_client.post.assert_awaited_once()
+    assert len(requests) == settings.email_api_max_retries + 1
+    assert mock_sleep.await_count == settings.email_api_max_retries
 
 
 @pytest.mark.asyncio
-async def test_send_email_http_status_error(mailpit_client, mock_http_client):
+async def test_send_email_http_status_error(mock_sleep, transport_client):
     """Test email sending with HTTP status error."""
     # Arrange
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.raise_for_status = MagicMock(
-        side_effect=httpx.HTTPStatusError(
-            "Server error", request=MagicMock(), response=mock_response
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, httpx.Response(500))
+    )
+
+    # Act
+    result = await mailpit_client.send_email(
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
+    )
+
+    # Assert
+    assert result is False
+    assert len(requests) == settings.email_api_max_retries + 1
+    assert mock_sleep.await_count == settings.email_api_max_retries
+
+
+@pytest.mark.asyncio
+async def test_send_email_retries_then_succeeds(mock_sleep, transport_client):
+    """Test that a transient failure is retried on the same client."""
+    # Arrange
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(
+            requests, httpx.ConnectError("Connection failed"), httpx.Response(200)
         )
     )
-    mock_http_client.post = AsyncMock(return_value=mock_response)
+
+    # Act
+    result = await mailpit_client.send_email(
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
+    )
+
+    # Assert
+    assert result is True
+    assert len(requests) == 2
+    mock_sleep.assert_awaited_once_with(settings.email_api_retry_backoff_seconds)
+
+
+@pytest.mark.asyncio
+async def test_send_email_client_error_not_retried(mock_sleep, transport_client):
+    """Test that 4xx responses fail immediately without retrying."""
+    # Arrange
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, httpx.Response(400))
+    )
 
     # Act
     result = await mailpit_client.send_email(
@@ -154,14 +278,18 @@ async def test_send_email_http_status_error(mailpit_client, mock_http_client):
 
     # Assert
     assert result is False
-    mock_http_client.post.assert_awaited_once()
+    assert len(requests) == 1
+    mock_sleep.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_send_email_unexpected_error(mailpit_client, mock_http_client):
+async def test_send_email_unexpected_error(transport_client):
     """Test email sending with unexpected error."""
     # Arrange
-    mock_http_client.post = AsyncMock(side_effect=Exception("Unexpected error"))
+    requests = []
+    mailpit_client = MailpitClient(
+        client=transport_client(requests, Exception("Unexpected error"))
+    )
 
     # Act
     result = await mailpit_client.send_email(
@@ -172,36 +300,45 @@ async def test_send_email_unexpected_error(mailpit_client, mock_http_client):
 
     # Assert
     assert result is False
-    mock_http_client.post.assert_awaited_once()
+    assert len(requests) == 1
 
 
 @pytest.mark.asyncio
 @patch("app.clients.mailpit_client.settings")
 async def test_send_email_uses_settings(mock_settings, mock_http_client):
     """Test that MailpitClient uses settings for defaults."""
-    # Arrange
     mock_settings.email_api_url = "http://test-mailpit:8025/api/v1/send"
     mock_settings.email_api_timeout = 15.0
-    mock_settings.from_email = "test@example.com"
+    mock_settings.from_email = "sender@example.com"
     mock_settings.from_name = "Test Sender"
 
     client = MailpitClient(client=mock_http_client)
 
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-    mock_http_client.post = AsyncMock(return_value=mock_response)
-
-    # Act
     await client.send_email(
-        to_email="recipient@example.com",
-        subject="Test",
-        text_body="Body",
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
     )
 
-    # Assert
-    call_args = mock_http_client.post.call_args
-    assert call_args.args[0] == "http://test-mailpit:8025/api/v1/send"
-    assert call_args.kwargs["timeout"] == 15.0
-    assert call_args.kwargs["json"]["From"]["Email"] == "test@example.com"
-    assert call_args.kwargs["json"]["From"]["Name"] == "Test Sender"
+    mock_http_client.post.assert_awaited_once_with(
+        "http://test-mailpit:8025/api/v1/send",
+        content=ANY,
+        headers=ANY,
+        timeout=15.0,
+    )
+    assert _sent_payload(mock_http_client) == {
+        **BASE_PAYLOAD,
+        "From": {"Email": "sender@example.com", "Name": "Test Sender"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_null_client_send_email_skips_http():
+    """Test that the no-op client reports success without sending anything."""
+    result = await NullMailpitClient().send_email(
+        to_email="test@example.com",
+        subject="Test Subject",
+        text_body="Test body",
+    )
+
+    assert result is True
@@ -0,0 +1,20 @@
+"""
+Fixtures for core unit tests.
+"""
+
+import pytest
+from argon2 import PasswordHasher
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(request, monkeypatch):
+    """
+    Hash with the minimum Argon2 cost, the tests only check round-trips.
+    Tests marked ``slow`` keep the production parameters.
+    """
+    if request.node.get_closest_marker("slow"):
+        return
+    monkeypatch.setattr(
+        "app.core.security._PASSWORD_HASHER",
+        PasswordHasher(time_cost=1, memory_cost=8, parallelism=1),
+    )
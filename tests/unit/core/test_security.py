@@ -1,5 +1,20 @@
+import asyncio
+import threading
+
+import bcrypt
 import pytest
-from app.core.security import hash_password, verify_password
+from unittest.mock import patch
+
+from app.core.security import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    needs_rehash,
+    shutdown_hash_executor,
+    verify_password_async,
+    _verified_passwords,
+)
+from app.exceptions.security import PasswordHashingBusyException
 
 
 @pytest.mark.parametrize(
@@ -40,3 +55,140 @@ def test_verify_password_parametrized(plain_password, test_password, expected):
         verify_password(plain_password=test_password, hashed_password=hashed)
         is expected
     )
+
+
+@pytest.mark.slow
+def test_hash_password_uses_argon2id():
+    hashed = hash_password(password="StrongPass123!")
+
+    assert hashed.startswith("$argon2id$")
+    assert needs_rehash(hashed) is False
+
+
+def test_verify_password_accepts_legacy_bcrypt_hash():
+    legacy = bcrypt.hashpw(b"StrongPass123!", bcrypt.gensalt(rounds=4)).decode()
+
+    assert verify_password("StrongPass123!", legacy) is True
+    assert verify_password("wrong_password", legacy) is False
+    assert needs_rehash(legacy) is True
+
+
+def test_verify_password_invalid_hash():
+    assert verify_password("StrongPass123!", "not-a-hash") is False
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    hashed = await hash_password_async(password="StrongPass123!")
+
+    assert hashed != "StrongPass123!"
+    assert await verify_password_async("StrongPass123!", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_hash_password_async_runs_on_dedicated_executor():
+    thread_names = []
+
+    def record_thread(password: str) -> str:
+        thread_names.append(threading.current_thread().name)
+        return "hashed"
+
+    with patch("app.core.security.hash_password", side_effect=record_thread):
+        assert await hash_password_async(password="StrongPass123!") == "hashed"
+
+    assert thread_names[0].startswith("password-hash")
+
+
+@pytest.mark.asyncio
+async def test_hash_password_async_after_executor_shutdown():
+    shutdown_hash_executor()
+
+    hashed = await hash_password_async(password="StrongPass123!")
+
+    assert verify_password("StrongPass123!", hashed) is True
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_caches_successful_verification():
+    hashed = hash_password(password="StrongPass123!")
+    _verified_passwords.clear()
+
+    with patch(
+        "app.core.security.verify_password", wraps=verify_password
+    ) as mock_verify:
+        assert await verify_password_async("StrongPass123!", hashed) is True
+        assert await verify_password_async("StrongPass123!", hashed) is True
+
+    mock_verify.assert_called_once()
+    assert "StrongPass123!" not in "".join(_verified_passwords)
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_does_not_cache_failures():
+    hashed = hash_password(password="StrongPass123!")
+    _verified_passwords.clear()
+
+    with patch(
+        "app.core.security.verify_password", wraps=verify_password
+    ) as mock_verify:
+        assert await verify_password_async("wrong_password", hashed) is False
+        assert await verify_password_async("wrong_password", hashed) is False
+
+    assert mock_verify.call_count == 2
+    assert len(_verified_passwords) == 0
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_expires_cached_verification():
+    hashed = hash_password(password="StrongPass123!")
+    _verified_passwords.clear()
+
+    with patch(
+        "app.core.security.verify_password", wraps=verify_password
+    ) as mock_verify:
+        assert await verify_password_async("StrongPass123!", hashed) is True
+        with patch("app.core.security.time.monotonic", return_value=float("inf")):
+            assert await verify_password_async("StrongPass123!", hashed) is True
+
+    assert mock_verify.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_hashing_slot_held_only_during_computation():
+    slots = asyncio.Semaphore(1)
+    locked_while_hashing = []
+
+    def record_slot(password: str) -> str:
+        locked_while_hashing.append(slots.locked())
+        return "hashed"
+
+    with patch("app.core.security._hashing_slots", slots), patch(
+        "app.core.security.hash_password", side_effect=record_slot
+    ):
+        assert await hash_password_async(password="StrongPass123!") == "hashed"
+
+    assert locked_while_hashing == [True]
+    assert not slots.locked()
+
+
+@pytest.mark.asyncio
+async def test_hashing_rejected_when_all_slots_busy():
+    slots = asyncio.Semaphore(1)
+
+    with patch("app.core.security._hashing_slots", slots):
+        async with slots:
+            with pytest.raises(PasswordHashingBusyException):
+                await hash_password_async(password="StrongPass123!")
+
+
+@pytest.mark.asyncio
+async def test_cached_verification_needs_no_hashing_slot():
+    hashed = hash_password(password="StrongPass123!")
+    _verified_passwords.clear()
+    assert await verify_password_async("StrongPass123!", hashed) is True
+
+    slots = asyncio.Semaphore(1)
+    with patch("app.core.security._hashing_slots", slots):
+        async with slots:
+            assert await verify_password_async("StrongPass123!", hashed) is True
@@ -2,7 +2,16 @@ import pytest
 from unittest.mock import patch, mock_open
 import builtins
 
-from app.core.utils import _get_poetry_tool_element
+from app.core.utils import _get_poetry_tool_element, _load_poetry_tool_data
+
+
+@pytest.fixture(autouse=True)
+def clear_pyproject_cache():
+    """Ensure every test parses pyproject.toml with its own patches."""
+    _load_poetry_tool_data.cache_clear()
+    yield
+    _load_poetry_tool_data.cache_clear()
+
 
 # ----------------------------
 # SUCCESS CASE
@@ -34,6 +43,23 @@ version = "1.2.3"
         assert result == "my-app"
 
 
+# ----------------------------
+# CACHED PARSE
+# ----------------------------
+
+
+def test_get_poetry_element_parses_file_once():
+    with patch("app.core.utils.tomllib.load") as mock_load:
+        mock_load.return_value = {
+            "tool": {"poetry": {"name": "my-app", "version": "1.2.3"}}
+        }
+
+        assert _get_poetry_tool_element("name") == "my-app"
+        assert _get_poetry_tool_element("version") == "1.2.3"
+
+        mock_load.assert_called_once()
+
+
 # ----------------------------
 # ELEMENT NOT FOUND
 # ----------------------------
@@ -49,6 +75,7 @@ def test_get_poetry_element_missing_logs_warning(caplog):
 
         assert result == "default-value"
         assert "not found" in caplog.text
+        assert "'description'" in caplog.text
 
 
 # ----------------------------
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from app.core.config import settings
 from app.db.pool import DatabasePool
 
 
@@ -17,6 +18,43 @@ async def test_connect_creates_pool():
 
         assert pool._pool == mock_pool
         mock_create.assert_awaited_once()
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs["server_settings"] == {"jit": "off"}
+        assert kwargs["statement_cache_size"] == settings.database_statement_cache_size
+        assert (
+            kwargs["max_cached_statement_lifetime"]
+            == settings.database_max_cached_statement_lifetime
+        )
+
+
+@pytest.mark.asyncio
+async def test_connect_prewarms_full_pool_by_default():
+    pool = DatabasePool()
+
+    with patch(
+        "app.db.pool.asyncpg.create_pool", new=AsyncMock(return_value=AsyncMock())
+    ) as mock_create:
+        await pool.connect()
+
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs["min_size"] == kwargs["max_size"]
+        assert kwargs["max_size"] == settings.database_pool_max_size
+
+
+@pytest.mark.asyncio
+@patch("app.db.pool.settings")
+async def test_connect_clamps_min_size_to_max_size(mock_settings):
+    pool = DatabasePool()
+    mock_settings.database_pool_min_size = 50
+    mock_settings.database_pool_max_size = 10
+
+    with patch(
+        "app.db.pool.asyncpg.create_pool", new=AsyncMock(return_value=AsyncMock())
+    ) as mock_create:
+        await pool.connect()
+
+        assert mock_create.call_args.kwargs["min_size"] == 10
+        assert mock_create.call_args.kwargs["max_size"] == 10
 
 
 @pytest.mark.asyncio
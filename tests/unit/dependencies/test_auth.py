@@ -0,0 +1,53 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPBasicCredentials
+from unittest.mock import AsyncMock, MagicMock
+
+from app.dependencies.auth import get_current_user
+from app.exceptions.security import PasswordHashingBusyException
+from app.exceptions.user import InvalidCredentialsException
+
+
+@pytest.fixture
+def user_service():
+    service = MagicMock()
+    service.authenticate_user = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_returns_authenticated_user(user_service):
+    user = {"id": 1, "email": "test@example.com", "is_active": False}
+    user_service.authenticate_user.return_value = user
+    credentials = HTTPBasicCredentials(username="test@example.com", password="pw")
+
+    result = await get_current_user(credentials=credentials, user_service=user_service)
+
+    assert result == user
+    user_service.authenticate_user.assert_awaited_once_with(
+        email="test@example.com", password="pw"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_invalid_credentials(user_service):
+    user_service.authenticate_user.side_effect = InvalidCredentialsException()
+    credentials = HTTPBasicCredentials(username="test@example.com", password="bad")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials=credentials, user_service=user_service)
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.headers == {"WWW-Authenticate": "Basic"}
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_hashing_busy(user_service):
+    user_service.authenticate_user.side_effect = PasswordHashingBusyException()
+    credentials = HTTPBasicCredentials(username="test@example.com", password="pw")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials=credentials, user_service=user_service)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "1"}
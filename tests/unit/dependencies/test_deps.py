@@ -1,6 +1,15 @@
+import httpx
 from unittest.mock import patch, MagicMock
 
-from app.dependencies.deps import get_db_pool, get_user_service, get_user_repository
+from app.dependencies.deps import (
+    get_db_pool,
+    get_user_service,
+    get_user_repository,
+    create_http_client,
+    get_http_client,
+    get_mailpit_client,
+)
+from app.clients.mailpit_client import MailpitClient, NullMailpitClient
 from app.repositories.user_repository import UserRepository
 from app.services.user_service import UserService
 
@@ -33,3 +42,54 @@ def test_get_user_service():
 
     assert isinstance(service, UserService)
     assert service.user_repository == mock_repo
+
+
+def test_get_http_client_returns_shared_client():
+    mock_client = MagicMock()
+    mock_request = MagicMock()
+    mock_request.app.state.http_client = mock_client
+
+    assert get_http_client(request=mock_request) is mock_client
+
+
+def test_get_mailpit_client_default():
+    result = get_mailpit_client(client=MagicMock())
+
+    assert isinstance(result, MailpitClient)
+
+
+def test_get_mailpit_client_disabled_returns_null_client():
+    with patch("app.dependencies.deps.settings") as mock_settings:
+        mock_settings.email_disabled = True
+        mock_settings.environment = "local"
+
+        result = get_mailpit_client(client=MagicMock())
+
+    assert isinstance(result, NullMailpitClient)
+
+
+def test_get_mailpit_client_disabled_ignored_in_production():
+    with patch("app.dependencies.deps.settings") as mock_settings:
+        mock_settings.email_disabled = True
+        mock_settings.environment = "production"
+
+        result = get_mailpit_client(client=MagicMock())
+
+    assert isinstance(result, MailpitClient)
+
+
+def test_create_http_client_uses_settings():
+    with patch("app.dependencies.deps.settings") as mock_settings, patch(
+        "app.dependencies.deps.httpx.AsyncClient"
+    ) as mock_client_cls:
+        mock_settings.http_client_timeout = 5.0
+        mock_settings.http_client_max_connections = 10
+        mock_settings.http_client_max_keepalive_connections = 4
+
+        create_http_client()
+
+    kwargs = mock_client_cls.call_args.kwargs
+    assert kwargs["timeout"] == httpx.Timeout(5.0)
+    assert kwargs["limits"] == httpx.Limits(
+        max_connections=10, max_keepalive_connections=4
+    )
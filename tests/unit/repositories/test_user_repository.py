@@ -1,82 +1,137 @@
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
-from datetime import datetime
+from uuid import UUID
+from datetime import datetime, timezone
 
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, _new_activation_code
 
-# -------------------------
-# CREATE USER
-# -------------------------
+USER_ID = UUID("12345678-1234-5678-1234-567812345678")
 
+CREATED_USER = {
+    "id": "uuid-123",
+    "email": "test@example.com",
+    "is_active": False,
+    "created_at": "2024-01-01T00:00:00Z",
+}
 
-@pytest.mark.asyncio
-async def test_create_user_success():
-    mock_row = {
-        "id": "uuid-123",
-        "email": "test@example.com",
-        "is_active": False,
-        "created_at": "2024-01-01T00:00:00Z",
-    }
+STORED_USER = {
+    "id": "uuid-123",
+    "email": "test@example.com",
+    "hashed_password": "hashed",
+    "is_active": False,
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+}
 
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = mock_row
 
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
+@pytest.fixture
+def mock_conn():
+    return AsyncMock()
 
-    repo = UserRepository(pool=mock_pool)
 
-    result = await repo.create_user("test@example.com", "hashed_password")
+@pytest.fixture
+def repo(mock_conn):
+    @asynccontextmanager
+    async def acquire():
+        yield mock_conn
 
-    assert result == mock_row
-    mock_conn.fetchrow.assert_awaited_once()
+    mock_pool = MagicMock()
+    mock_pool.acquire = acquire
+    return UserRepository(pool=mock_pool)
 
 
 # -------------------------
-# GET USER BY EMAIL
+# SINGLE-STATEMENT READS
 # -------------------------
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_email_found():
-    mock_row = {
-        "id": "uuid-123",
-        "email": "test@example.com",
-        "hashed_password": "hashed",
-        "is_active": False,
-        "created_at": datetime.utcnow(),
-    }
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = mock_row
+@pytest.mark.parametrize(
+    "method, args, fetch, row, expected, expected_sql",
+    [
+        (
+            "create_user",
+            ("test@example.com", "hashed_password"),
+            "fetchrow",
+            CREATED_USER,
+            CREATED_USER,
+            "ON CONFLICT",
+        ),
+        (
+            "create_user",
+            ("test@example.com", "hashed_password"),
+            "fetchrow",
+            None,
+            None,
+            "ON CONFLICT",
+        ),
+        (
+            "get_user_by_email",
+            ("test@example.com",),
+            "fetchrow",
+            STORED_USER,
+            STORED_USER,
+            "LOWER(u.email) = LOWER($1)",
+        ),
+        (
+            "get_user_by_email",
+            ("missing@example.com",),
+            "fetchrow",
+            None,
+            None,
+            "LOWER(u.email) = LOWER($1)",
+        ),
+        (
+            "activate_with_code",
+            (USER_ID, "1234"),
+            "fetchval",
+            True,
+            True,
+            "DELETE FROM activation_codes",
+        ),
+        (
+            "activate_with_code",
+            (USER_ID, "9999"),
+            "fetchval",
+            False,
+            False,
+            "DELETE FROM activation_codes",
+        ),
+    ],
+    ids=[
+        "create_user",
+        "create_user_duplicate",
+        "get_user_by_email_found",
+        "get_user_by_email_not_found",
+        "activate_with_code_valid",
+        "activate_with_code_invalid",
+    ],
+)
+async def test_repository_fetch(
+    repo, mock_conn, method, args, fetch, row, expected, expected_sql
+):
+    getattr(mock_conn, fetch).return_value = row
+
+    result = await getattr(repo, method)(*args)
+
+    assert result == expected
+    getattr(mock_conn, fetch).assert_awaited_once()
+    query, *bound = getattr(mock_conn, fetch).await_args.args
+    assert expected_sql in query
+    assert tuple(bound) == args
 
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
 
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.get_user_by_email("test@example.com")
-
-    assert result == mock_row
+# -------------------------
+# UPDATE HASHED PASSWORD
+# -------------------------
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_email_not_found():
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = None
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
+async def test_update_hashed_password(repo, mock_conn):
+    await repo.update_hashed_password(USER_ID, "new_hash")
 
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.get_user_by_email("missing@example.com")
-
-    assert result is None
+    mock_conn.execute.assert_awaited_once()
+    assert mock_conn.execute.await_args.args[1:] == (USER_ID, "new_hash")
 
 
 # -------------------------
@@ -86,174 +141,25 @@ async def test_get_user_by_email_not_found():
 
 @pytest.mark.asyncio
 @patch("app.repositories.user_repository.settings")
-@patch("app.repositories.user_repository.secrets.randbelow")
-async def test_create_activation_code_success(mock_randbelow, mock_settings):
-    user_id = uuid4()
-
-    mock_randbelow.return_value = 1234
+@patch("app.repositories.user_repository._new_activation_code")
+async def test_create_activation_code_success(
+    mock_new_code, mock_settings, repo, mock_conn
+):
+    mock_new_code.return_value = "2234"
     mock_settings.activation_code_ttl_seconds = 60
 
-    mock_conn = AsyncMock()
-    mock_conn.execute = AsyncMock()
-
-    # Proper transaction mock
-    mock_transaction = MagicMock()
-    mock_transaction.__aenter__ = AsyncMock(return_value=None)
-    mock_transaction.__aexit__ = AsyncMock(return_value=None)
-    mock_conn.transaction.return_value = mock_transaction
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    code = await repo.create_activation_code(user_id)
+    code = await repo.create_activation_code(USER_ID)
 
     assert code == "2234"
-
-
-# -------------------------
-# VERIFY ACTIVATION CODE
-# -------------------------
-
-
-@pytest.mark.asyncio
-async def test_verify_activation_code_valid():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = {"id": 1}
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.verify_activation_code(user_id, "1234")
-
-    assert result is True
-
-
-@pytest.mark.asyncio
-async def test_verify_activation_code_invalid():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = None
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.verify_activation_code(user_id, "9999")
-
-    assert result is False
-
-
-# -------------------------
-# DELETE ACTIVATION CODE
-# -------------------------
-
-
-@pytest.mark.asyncio
-async def test_delete_activation_code():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.execute = AsyncMock()
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    await repo.delete_activation_code(user_id)
-
+    mock_new_code.assert_called_once_with()
     mock_conn.execute.assert_awaited_once()
+    query, *args = mock_conn.execute.await_args.args
+    assert "ON CONFLICT (user_id) DO UPDATE" in query
+    assert args == [USER_ID, "2234", 60]
+    mock_conn.transaction.assert_not_called()
 
 
-# -------------------------
-# HAS ACTIVATION CODE
-# -------------------------
-
-
-@pytest.mark.asyncio
-async def test_has_activation_code_true():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = {"id": 1}
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.has_activation_code(user_id)
-
-    assert result is True
-
-
-@pytest.mark.asyncio
-async def test_has_activation_code_false():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = None
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.has_activation_code(user_id)
-
-    assert result is False
-
-
-# -------------------------
-# ACTIVATE USER
-# -------------------------
-
-
-@pytest.mark.asyncio
-async def test_activate_user_success():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = {"id": user_id}
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.activate_user(user_id)
-
-    assert result is True
-
-
-@pytest.mark.asyncio
-async def test_activate_user_not_updated():
-    user_id = uuid4()
-
-    mock_conn = AsyncMock()
-    mock_conn.fetchrow.return_value = None
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
-    mock_pool.acquire.return_value.__aexit__.return_value = AsyncMock()
-
-    repo = UserRepository(pool=mock_pool)
-
-    result = await repo.activate_user(user_id)
-
-    assert result is False
+def test_new_activation_code_is_four_digits():
+    for _ in range(100):
+        code = _new_activation_code()
+        assert len(code) == 4 and 1000 <= int(code) <= 9999
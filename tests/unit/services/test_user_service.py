@@ -1,8 +1,13 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from asyncpg.exceptions import UniqueViolationError
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from types import MappingProxyType
+from unittest.mock import AsyncMock, patch
 from fastapi import BackgroundTasks
 
+from app.core.config import settings
+from app.repositories.user_repository import UserRepository
+from app.services.email_service import EmailService
 from app.services.user_service import UserService
 from app.exceptions.user import (
     UserAlreadyExistsException,
@@ -12,6 +17,27 @@ from app.exceptions.user import (
     InvalidActivationCodeException,
 )
 
+# Row shape returned by UserRepository.create_user, shared read-only
+CREATED_USER = MappingProxyType(
+    {
+        "id": 1,
+        "email": "test@example.com",
+        "is_active": False,
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+)
+
+# Row shape returned by UserRepository.get_user_by_email, shared read-only
+STORED_USER = MappingProxyType(
+    {
+        "id": 1,
+        "email": "test@example.com",
+        "hashed_password": "hashed_pw",
+        "is_active": False,
+        "has_activation_code": True,
+    }
+)
+
 # ==========================================================
 # Fixtures
 # ==========================================================
@@ -19,12 +45,12 @@ from app.exceptions.user import (
 
 @pytest.fixture
 def mock_user_repository():
-    return AsyncMock()
+    return AsyncMock(spec=UserRepository)
 
 
 @pytest.fixture
 def mock_email_service():
-    return AsyncMock()
+    return AsyncMock(spec=EmailService)
 
 
 @pytest.fixture
@@ -37,57 +63,68 @@ def user_service(mock_user_repository, mock_email_service):
 
 @pytest.fixture
 def background_tasks():
-    return MagicMock(spec=BackgroundTasks)
+    return BackgroundTasks()
 
 
-# ==========================================================
-# register_user
-# ==========================================================
+# Password hashing is always mocked here, so no test can fall back to real
+# Argon2 by forgetting a patch; tests only override the return values.
+@pytest.fixture(autouse=True)
+def mock_hash_password():
+    with patch(
+        "app.services.user_service.hash_password_async",
+        new_callable=AsyncMock,
+        return_value="hashed_pw",
+    ) as mock:
+        yield mock
 
 
-@pytest.mark.asyncio
-@patch("app.services.user_service.hash_password", return_value="hashed_pw")
-@patch("app.services.user_service.settings")
-async def test_register_user_success_without_activation(
-    mock_settings,
-    mock_hash,
-    user_service,
-    mock_user_repository,
-    background_tasks,
-):
-    mock_settings.send_activation_code_on_registration = False
+@pytest.fixture(autouse=True)
+def mock_verify_password():
+    with patch(
+        "app.services.user_service.verify_password_async",
+        new_callable=AsyncMock,
+        return_value=True,
+    ) as mock:
+        yield mock
 
-    mock_user_repository.create_user.return_value = {
-        "id": 1,
-        "email": "test@example.com",
-    }
 
-    result = await user_service.register_user(
-        "test@example.com",
-        "password",
-        background_tasks,
-    )
+@pytest.fixture(autouse=True)
+def mock_needs_rehash():
+    with patch("app.services.user_service.needs_rehash", return_value=False) as mock:
+        yield mock
+
+
+def expect(exc):
+    """Expect ``exc`` to be raised, or nothing when it is None."""
+    return pytest.raises(exc) if exc else nullcontext()
 
-    assert result["email"] == "test@example.com"
-    mock_user_repository.create_user.assert_awaited_once()
+
+def assert_activation_code_scheduled(background_tasks, user_service, user_id, email):
+    assert len(background_tasks.tasks) == 1
+    task = background_tasks.tasks[0]
+    assert task.func == user_service._generate_and_send_activation_code
+    assert task.args == ()
+    assert task.kwargs == {"user_id": user_id, "email": email}
+
+
+# ==========================================================
+# register_user
+# ==========================================================
 
 
 @pytest.mark.asyncio
-@patch("app.services.user_service.hash_password", return_value="hashed_pw")
-@patch("app.services.user_service.settings")
-async def test_register_user_success_with_activation(
-    mock_settings,
-    mock_hash,
+@pytest.mark.parametrize("activation_on", [False, True])
+async def test_register_user_success(
+    activation_on,
+    monkeypatch,
     user_service,
     mock_user_repository,
+    mock_email_service,
     background_tasks,
 ):
-    mock_settings.send_activation_code_on_registration = True
+    monkeypatch.setattr(settings, "send_activation_code_on_registration", activation_on)
 
-    mock_user_repository.create_user.return_value = {
-        "id": 1,
-        "email": "test@example.com",
-    }
+    mock_user_repository.create_user.return_value = CREATED_USER
 
     result = await user_service.register_user(
         "test@example.com",
@@ -95,26 +132,28 @@ async def test_register_user_success_with_activation(
         background_tasks,
     )
 
-    assert result["email"] == "test@example.com"
-    background_tasks.add_task.assert_called_once_with(
-        user_service._generate_and_send_activation_code,
-        user_id=1,
-        email="test@example.com",
+    assert result == CREATED_USER
+    mock_user_repository.create_user.assert_awaited_once_with(
+        email="test@example.com", hashed_password="hashed_pw"
     )
+    if activation_on:
+        assert_activation_code_scheduled(
+            background_tasks, user_service, user_id=1, email="test@example.com"
+        )
+    else:
+        assert background_tasks.tasks == []
+    # Email dispatch is deferred until after the response is sent
+    mock_user_repository.create_activation_code.assert_not_awaited()
+    mock_email_service.send_activation_code.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-@patch("app.services.user_service.hash_password", return_value="hashed_pw")
 async def test_register_user_duplicate_email(
-    mock_hash,
     user_service,
     mock_user_repository,
     background_tasks,
 ):
-    mock_user_repository.create_user.side_effect = UniqueViolationError(
-        "error",
-        "detail",
-    )
+    mock_user_repository.create_user.return_value = None
 
     with pytest.raises(UserAlreadyExistsException):
         await user_service.register_user(
@@ -130,17 +169,11 @@ async def test_register_user_duplicate_email(
 
 
 @pytest.mark.asyncio
-@patch("app.services.user_service.verify_password", return_value=True)
 async def test_authenticate_user_success(
-    mock_verify,
     user_service,
     mock_user_repository,
 ):
-    mock_user_repository.get_user_by_email.return_value = {
-        "id": 1,
-        "email": "test@example.com",
-        "hashed_password": "hashed_pw",
-    }
+    mock_user_repository.get_user_by_email.return_value = STORED_USER
 
     user = await user_service.authenticate_user(
         "test@example.com",
@@ -148,6 +181,29 @@ async def test_authenticate_user_success(
     )
 
     assert user["id"] == 1
+    mock_user_repository.update_hashed_password.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_upgrades_legacy_hash(
+    mock_hash_password,
+    mock_needs_rehash,
+    user_service,
+    mock_user_repository,
+):
+    mock_hash_password.return_value = "argon2_hash"
+    mock_needs_rehash.return_value = True
+    mock_user_repository.get_user_by_email.return_value = {
+        **STORED_USER,
+        "hashed_password": "$2b$10$legacy",
+    }
+
+    await user_service.authenticate_user("test@example.com", "password")
+
+    mock_hash_password.assert_awaited_once_with(password="password")
+    mock_user_repository.update_hashed_password.assert_awaited_once_with(
+        1, "argon2_hash"
+    )
 
 
 @pytest.mark.asyncio
@@ -165,17 +221,13 @@ async def test_authenticate_user_not_found(
 
 
 @pytest.mark.asyncio
-@patch("app.services.user_service.verify_password", return_value=False)
 async def test_authenticate_user_invalid_password(
-    mock_verify,
+    mock_verify_password,
     user_service,
     mock_user_repository,
 ):
-    mock_user_repository.get_user_by_email.return_value = {
-        "id": 1,
-        "email": "test@example.com",
-        "hashed_password": "hashed_pw",
-    }
+    mock_verify_password.return_value = False
+    mock_user_repository.get_user_by_email.return_value = STORED_USER
 
     with pytest.raises(InvalidCredentialsException):
         await user_service.authenticate_user(
@@ -190,123 +242,27 @@ async def test_authenticate_user_invalid_password(
 
 
 @pytest.mark.asyncio
-async def test_generate_and_send_activation_code_success(
-    user_service,
-    mock_user_repository,
-    mock_email_service,
-):
-    mock_user_repository.create_activation_code.return_value = "1234"
-
-    await user_service._generate_and_send_activation_code(
-        user_id=1,
-        email="test@example.com",
-    )
-
-    mock_user_repository.create_activation_code.assert_awaited_once_with(1)
-    mock_email_service.send_activation_code.assert_awaited_once_with(
-        to_email="test@example.com",
-        code="1234",
-    )
-
-
-@pytest.mark.asyncio
-async def test_generate_and_send_activation_code_failure_in_generation(
-    user_service,
-    mock_user_repository,
-    mock_email_service,
-):
-    mock_user_repository.create_activation_code.side_effect = Exception(
-        "Database error"
-    )
-
-    # Should not raise, errors are logged
-    await user_service._generate_and_send_activation_code(
-        user_id=1,
-        email="test@example.com",
-    )
-
-    mock_user_repository.create_activation_code.assert_awaited_once_with(1)
-    mock_email_service.send_activation_code.assert_not_awaited()
-
-
-@pytest.mark.asyncio
-async def test_generate_and_send_activation_code_failure_in_sending(
-    user_service,
-    mock_user_repository,
-    mock_email_service,
-):
-    mock_user_repository.create_activation_code.return_value = "1234"
-    mock_email_service.send_activation_code.side_effect = Exception("Email error")
-
-    # Should not raise, errors are logged
-    await user_service._generate_and_send_activation_code(
-        user_id=1,
-        email="test@example.com",
-    )
-
-    mock_user_repository.create_activation_code.assert_awaited_once_with(1)
-    mock_email_service.send_activation_code.assert_awaited_once()
-
-
-# ==========================================================
-# request_activation_code
-# ==========================================================
-
-
-@pytest.mark.asyncio
-async def test_request_activation_code_success(
-    user_service,
-    mock_user_repository,
-    background_tasks,
-):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": False}
-    )
-
-    await user_service.request_activation_code(
-        "test@example.com",
-        "password",
-        background_tasks,
-    )
-
-    background_tasks.add_task.assert_called_once_with(
-        user_service._generate_and_send_activation_code,
-        user_id=1,
-        email="test@example.com",
-    )
-
-
-@pytest.mark.asyncio
-async def test_request_activation_code_user_already_active(
+@pytest.mark.parametrize(
+    "is_active, expected_exc",
+    [(False, None), (True, UserAlreadyActivatedException)],
+    ids=["success", "already_active"],
+)
+async def test_request_activation_code(
+    is_active,
+    expected_exc,
     user_service,
     background_tasks,
 ):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": True}
-    )
+    user = {**STORED_USER, "is_active": is_active}
 
-    with pytest.raises(UserAlreadyActivatedException):
-        await user_service.request_activation_code(
-            "test@example.com",
-            "password",
-            background_tasks,
-        )
-
-
-@pytest.mark.asyncio
-async def test_request_activation_code_invalid_credentials(
-    user_service,
-    background_tasks,
-):
-    user_service.authenticate_user = AsyncMock(
-        side_effect=InvalidCredentialsException()
-    )
+    with expect(expected_exc):
+        await user_service.request_activation_code(user, background_tasks)
 
-    with pytest.raises(InvalidCredentialsException):
-        await user_service.request_activation_code(
-            "test@example.com",
-            "password",
-            background_tasks,
+    if expected_exc:
+        assert background_tasks.tasks == []
+    else:
+        assert_activation_code_scheduled(
+            background_tasks, user_service, user_id=1, email="test@example.com"
         )
 
 
@@ -316,89 +272,35 @@ async def test_request_activation_code_invalid_credentials(
 
 
 @pytest.mark.asyncio
-async def test_activate_user_success(
-    user_service,
-    mock_user_repository,
-):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": False}
-    )
-
-    mock_user_repository.has_activation_code.return_value = True
-    mock_user_repository.verify_activation_code.return_value = True
-
-    await user_service.activate_user(
-        "test@example.com",
-        "password",
-        "1234",
-    )
-
-    mock_user_repository.activate_user.assert_awaited_once_with(1)
-    mock_user_repository.delete_activation_code.assert_awaited_once_with(1)
-
-
-@pytest.mark.asyncio
-async def test_activate_user_already_active(user_service):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": True}
-    )
-
-    with pytest.raises(UserAlreadyActivatedException):
-        await user_service.activate_user(
-            "test@example.com",
-            "password",
-            "1234",
-        )
-
-
-@pytest.mark.asyncio
-async def test_activate_user_no_activation_code(
-    user_service,
-    mock_user_repository,
-):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": False}
-    )
-
-    mock_user_repository.has_activation_code.return_value = False
-
-    with pytest.raises(NoActivationCodeException):
-        await user_service.activate_user(
-            "test@example.com",
-            "password",
-            "1234",
-        )
-
-
-@pytest.mark.asyncio
-async def test_activate_user_invalid_code(
+@pytest.mark.parametrize(
+    "is_active, has_activation_code, code_matches, expected_exc",
+    [
+        (False, True, True, None),
+        (True, True, True, UserAlreadyActivatedException),
+        (False, False, False, NoActivationCodeException),
+        (False, True, False, InvalidActivationCodeException),
+    ],
+    ids=["success", "already_active", "no_activation_code", "invalid_code"],
+)
+async def test_activate_user(
+    is_active,
+    has_activation_code,
+    code_matches,
+    expected_exc,
     user_service,
     mock_user_repository,
 ):
-    user_service.authenticate_user = AsyncMock(
-        return_value={"id": 1, "is_active": False}
-    )
-
-    mock_user_repository.has_activation_code.return_value = True
-    mock_user_repository.verify_activation_code.return_value = False
-
-    with pytest.raises(InvalidActivationCodeException):
-        await user_service.activate_user(
-            "test@example.com",
-            "password",
-            "wrong_code",
-        )
+    user = {
+        **STORED_USER,
+        "is_active": is_active,
+        "has_activation_code": has_activation_code,
+    }
+    mock_user_repository.activate_with_code.return_value = code_matches
 
+    with expect(expected_exc):
+        await user_service.activate_user(user, "1234")
 
-@pytest.mark.asyncio
-async def test_activate_user_invalid_credentials(user_service):
-    user_service.authenticate_user = AsyncMock(
-        side_effect=InvalidCredentialsException()
-    )
-
-    with pytest.raises(InvalidCredentialsException):
-        await user_service.activate_user(
-            "test@example.com",
-            "password",
-            "1234",
-        )
+    if is_active or not has_activation_code:
+        mock_user_repository.activate_with_code.assert_not_awaited()
+    else:
+        mock_user_repository.activate_with_code.assert_awaited_once_with(1, "1234")